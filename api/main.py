@@ -10,22 +10,34 @@ import gc
 import os
 import uuid
 import json
-import queue
 import asyncio
+import hashlib
+import heapq
 import shutil
+import concurrent.futures
 import resource
+import threading
+import time
 import logging
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
-from collections import defaultdict
 from typing import Optional, List
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from sse_starlette.sse import EventSourceResponse
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=str)
 
 # Add src to path so cognitionflow is importable when running from repo root
 import sys
@@ -39,7 +51,7 @@ from cognitionflow.config import (
     AVAILABLE_MODELS, AGENT_MODES,
     TASK_TEMPLATES, OUTPUT_FORMATS, get_config_with_overrides
 )
-from cognitionflow.orchestration import run_workflow, get_template_prompt
+from cognitionflow.orchestration import run_workflow, get_template_prompt, discover_artifacts, iso_now
 
 # Import database functions
 from api.db import save_run, get_run_history, get_metrics as db_get_metrics, get_run_by_id
@@ -72,68 +84,248 @@ def _get_process_memory_mb() -> float:
 # Memory Optimization: Concurrent Run Limiter
 # ============================================================================
 MAX_CONCURRENT_RUNS = 1  # Strict: one run at a time to stay under 500 MB
-run_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+
+
+class RunLimiter:
+    """Admission control for workflow runs: explicit active counter guarded by a Condition."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active_count = 0
+        self._cv = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cv:
+            while self.active_count >= self.limit:
+                await self._cv.wait()
+            self.active_count += 1
+
+    async def release(self) -> None:
+        async with self._cv:
+            self.active_count -= 1
+            self._cv.notify(1)
+
+
+run_limiter = RunLimiter(MAX_CONCURRENT_RUNS)
 
 # Store run state and message queues for SSE streaming
-RUNS: dict[str, dict] = {}
-RUN_QUEUES: dict[str, queue.Queue] = {}
+MAX_TRACKED_RUNS = 500  # Older runs are served from the DB by GET /runs/{id}
+
+
+class _RunStore(OrderedDict):
+    """In-memory run state ordered by last update.
+
+    Beyond maxsize the stalest finished run is evicted (along with any SSE
+    queue nobody drained); running entries are never evicted. Written from
+    both the event loop and the worker pool, so writes take a lock; readers
+    use single get() calls.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key in self:
+                self.move_to_end(key)
+            super().__setitem__(key, value)
+            if len(self) > self.maxsize:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds self._lock
+        for run_id, state in self.items():
+            if state.get("status") != "running":
+                break
+        else:
+            return
+        del self[run_id]
+        RUN_QUEUES.pop(run_id, None)
 
-# Rate limiting: simple in-memory counter (resets on restart)
+
+RUNS: _RunStore = _RunStore(MAX_TRACKED_RUNS)
+RUN_QUEUES: dict[str, asyncio.Queue] = {}
+RUN_QUEUE_MAXSIZE = 1000  # Bounded: a slow SSE client loses its oldest messages, not RAM
+SSE_BATCH_MAX = 32  # Max queued frames coalesced into one SSE write
+
+# Message types streamed as their own SSE event name (see GET /runs/{id}/stream)
+SSE_MESSAGE_EVENTS = frozenset({
+    "phase_change",
+    "agent_message",
+    "code_generation",
+    "code_execution",
+    "review_approved",
+})
+
+
+def _encode_sse_event(msg: dict) -> tuple[str, str]:
+    """
+    Serialize a run message once into an (event, data) SSE frame.
+    Typed event names let the client route by type; unknown types fall back to "message".
+    """
+    event_type = msg.get("type")
+    if event_type != "done" and event_type not in SSE_MESSAGE_EVENTS:
+        event_type = "message"
+    return event_type, _dumps(msg)
+
+
+def _enqueue_drop_oldest(q: asyncio.Queue, frame: tuple[str, str]) -> None:
+    """Put frame on q (runs on the event loop); if full, drop the oldest queued frame."""
+    try:
+        q.put_nowait(frame)
+    except asyncio.QueueFull:
+        q.get_nowait()
+        logger.warning("SSE queue full, dropped oldest message")
+        q.put_nowait(frame)
+
+
+# Rate limiting: in-memory GCRA per client IP (resets on restart)
 RATE_LIMIT_WINDOW = 60  # seconds
-RATE_LIMIT_MAX = 10  # requests per window
-rate_limit_store: dict[str, list] = defaultdict(list)
+RATE_LIMIT_MAX = 10  # requests per window (max burst)
+RATE_LIMIT_EMISSION_INTERVAL = RATE_LIMIT_WINDOW / RATE_LIMIT_MAX  # seconds per request
+RATE_LIMIT_BURST_TOLERANCE = RATE_LIMIT_WINDOW - RATE_LIMIT_EMISSION_INTERVAL
+MAX_TRACKED_IPS = 10_000  # Bound memory for a public endpoint
+RATE_LIMIT_SHARDS = 16  # Power of two; IPs in different shards never share a lock
+
+
+class _BoundedIPStore(OrderedDict):
+    """Per-IP state ordered by last update; evicts the stalest IP beyond maxsize."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# Sharded by IP hash: each shard is ip -> TAT (monotonic) with its own lock
+_rate_limit_shards: list[tuple[_BoundedIPStore, threading.Lock]] = [
+    (_BoundedIPStore(MAX_TRACKED_IPS // RATE_LIMIT_SHARDS), threading.Lock())
+    for _ in range(RATE_LIMIT_SHARDS)
+]
+
+
+def _rate_limit_shard(client_ip: str) -> tuple[_BoundedIPStore, threading.Lock]:
+    return _rate_limit_shards[hash(client_ip) & (RATE_LIMIT_SHARDS - 1)]
 
 
 # ============================================================================
 # Workspace Cleanup (Memory Optimization)
 # ============================================================================
 CLEANUP_AGE_HOURS = 1  # Delete workspaces older than this
+CLEANUP_INTERVAL_SECONDS = CLEANUP_AGE_HOURS * 3600 / 4  # Background sweep period
+
+# Age index of known workspaces: (mtime, path) min-heap, oldest first.
+# Seeded by the startup scan and pushed to by /run, so periodic cleanup
+# only touches expired entries instead of listing the whole directory.
+_workspace_heap: list[tuple[float, str]] = []
+_workspace_heap_lock = threading.Lock()  # Cleanup runs in a worker thread
+
+
+def track_workspace(path: str) -> None:
+    """Register a new workspace folder with the cleanup age index."""
+    with _workspace_heap_lock:
+        heapq.heappush(_workspace_heap, (time.time(), path))
 
 
 def cleanup_old_workspaces():
-    """Delete workspace folders older than CLEANUP_AGE_HOURS."""
+    """Delete workspace folders older than CLEANUP_AGE_HOURS (full scan; seeds the age index)."""
     base_dir = get_workspace_dir()
     if not os.path.exists(base_dir):
         return
     
-    cutoff = datetime.utcnow() - timedelta(hours=CLEANUP_AGE_HOURS)
+    cutoff = time.time() - CLEANUP_AGE_HOURS * 3600
     cleaned = 0
+    survivors: list[tuple[float, str]] = []
     
-    for folder in os.listdir(base_dir):
-        folder_path = os.path.join(base_dir, folder)
-        if not os.path.isdir(folder_path):
-            continue
-        
-        try:
-            # Check folder modification time
-            mtime = datetime.utcfromtimestamp(os.path.getmtime(folder_path))
-            if mtime < cutoff:
-                shutil.rmtree(folder_path)
-                cleaned += 1
-        except Exception:
-            pass
+    # scandir: d_type answers is_dir() without a stat, and DirEntry caches stat()
+    with os.scandir(base_dir) as it:
+        for entry in it:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+                if mtime < cutoff:
+                    shutil.rmtree(entry.path)
+                    cleaned += 1
+                else:
+                    survivors.append((mtime, entry.path))
+            except Exception:
+                pass
     
+    heapq.heapify(survivors)
+    with _workspace_heap_lock:
+        _workspace_heap[:] = survivors
     return cleaned
 
 
+def cleanup_expired_workspaces() -> int:
+    """Delete indexed workspaces older than CLEANUP_AGE_HOURS, popping only expired entries."""
+    cutoff = time.time() - CLEANUP_AGE_HOURS * 3600
+    expired = []
+    with _workspace_heap_lock:
+        while _workspace_heap and _workspace_heap[0][0] < cutoff:
+            expired.append(heapq.heappop(_workspace_heap)[1])
+
+    cleaned = 0
+    for folder_path in expired:
+        try:
+            mtime = os.path.getmtime(folder_path)
+        except OSError:
+            continue  # Already gone
+        if mtime >= cutoff:
+            # Still being written to (e.g. a long run): re-index at its real age
+            with _workspace_heap_lock:
+                heapq.heappush(_workspace_heap, (mtime, folder_path))
+            continue
+        shutil.rmtree(folder_path, ignore_errors=True)
+        cleaned += 1
+    return cleaned
+
+
+async def _periodic_workspace_cleanup() -> None:
+    """Background task: sweep expired workspaces every CLEANUP_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+        try:
+            # rmtree on large workspaces must not stall SSE streams or /health
+            cleaned = await asyncio.to_thread(cleanup_expired_workspaces)
+            if cleaned:
+                logger.info("Workspace cleanup removed %d folder(s)", cleaned)
+        except Exception as e:
+            logger.warning("Workspace cleanup failed: %s", e)
+
+
 # ============================================================================
 # Rate Limiting
 # ============================================================================
 def check_rate_limit(client_ip: str) -> bool:
-    """Check if client has exceeded rate limit. Returns True if allowed."""
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=RATE_LIMIT_WINDOW)
-    
-    # Clean old entries
-    rate_limit_store[client_ip] = [
-        ts for ts in rate_limit_store[client_ip] if ts > window_start
-    ]
-    
-    if len(rate_limit_store[client_ip]) >= RATE_LIMIT_MAX:
-        return False
-    
-    rate_limit_store[client_ip].append(now)
-    return True
+    """
+    Check if client has exceeded rate limit. Returns True if allowed.
+    GCRA: one theoretical arrival time per IP, advanced by the emission interval per request.
+    """
+    store, lock = _rate_limit_shard(client_ip)
+    now = time.monotonic()
+    with lock:
+        # Drop stale IPs from the front: a TAT in the past carries no state
+        while store:
+            oldest_ip, oldest_tat = next(iter(store.items()))
+            if oldest_tat > now:
+                break
+            del store[oldest_ip]
+
+        tat = max(store.get(client_ip, now), now)
+        if tat - now > RATE_LIMIT_BURST_TOLERANCE:
+            return False
+        store[client_ip] = tat + RATE_LIMIT_EMISSION_INTERVAL
+        return True
 
 
 # ============================================================================
@@ -175,30 +367,66 @@ class ConfigResponse(BaseModel):
 # ============================================================================
 # Workflow Runner
 # ============================================================================
-def _run_sync(work_dir: str, run_id: str, config: RunConfig) -> None:
+def _index_artifacts(artifacts: list[dict]) -> dict[str, str]:
+    """Map artifact file name -> path once per run for O(1) artifact lookups."""
+    return {os.path.basename(a["path"]): a["path"] for a in artifacts if a.get("path")}
+
+
+def _public_state(state: dict) -> dict:
+    """Run state as served by GET /runs/{id}: underscore keys are server-internal."""
+    return {k: v for k, v in state.items() if not k.startswith("_")}
+
+
+def _primary_artifacts(artifacts: list[dict]) -> tuple[str | None, str | None]:
+    """First .md report and first .png plot, in a single pass that stops once both are found."""
+    report = plot = None
+    for a in artifacts:
+        p = a.get("path", "")
+        ext = os.path.splitext(p)[1].lower()
+        if ext == ".md" and report is None:
+            report = p
+        elif ext == ".png" and plot is None:
+            plot = p
+        if report and plot:
+            break
+    return report, plot
+
+
+def _run_sync(work_dir: str, run_id: str, config: RunConfig, loop: asyncio.AbstractEventLoop) -> None:
     """Run workflow synchronously and record result. Pushes messages to queue for SSE."""
     q = RUN_QUEUES.get(run_id)
-    start_time = datetime.utcnow()
+    # Wall-clock and monotonic start from the same moment (after any wait on
+    # run_limiter), so started_at, completed_at and duration_ms agree
+    started_at = iso_now()
+    start_mono = time.monotonic()
+    config_dict = config.model_dump()  # Dumped once; shared by RUNS and the DB rows
     
     def on_message(msg: dict) -> None:
-        """Callback to push messages to queue for SSE streaming."""
+        """Callback to push messages to queue for SSE streaming (hops onto the event loop)."""
         if q:
             try:
-                q.put(msg)
-            except Exception:
-                pass  # Don't fail if queue is closed
+                loop.call_soon_threadsafe(_enqueue_drop_oldest, q, _encode_sse_event(msg))
+            except RuntimeError:
+                pass  # Don't fail if the event loop is closed
     
     try:
+        # Initial row is written from the worker, off the /run request path;
+        # the final save_run below upserts over it.
+        save_run(
+            run_id=run_id,
+            status="running",
+            config=config_dict,
+            started_at=started_at,
+        )
         load_env()
         
         # Send phase change
-        if q:
-            q.put({
-                "type": "phase_change",
-                "phase": "initializing",
-                "message": f"Initializing agents (model: {config.model})...",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            })
+        on_message({
+            "type": "phase_change",
+            "phase": "initializing",
+            "message": f"Initializing agents (model: {config.model})...",
+            "timestamp": iso_now(),
+        })
         
         task_prompt = config.task_prompt
         if config.template_id and not task_prompt:
@@ -213,27 +441,19 @@ def _run_sync(work_dir: str, run_id: str, config: RunConfig) -> None:
             agent_mode=config.agent_mode,
         )
         
-        end_time = datetime.utcnow()
-        duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        completed_at = iso_now()
+        duration_ms = int((time.monotonic() - start_mono) * 1000)
         
         # Derive primary report/plot from dynamic artifacts (backward compat)
         artifacts = result.get("artifacts", [])
-        artifact_report = None
-        artifact_plot = None
-        for a in artifacts:
-            p = a.get("path", "")
-            if p.endswith(".md") and artifact_report is None:
-                artifact_report = p
-            if p.endswith(".png") and artifact_plot is None:
-                artifact_plot = p
+        artifact_report, artifact_plot = _primary_artifacts(artifacts)
         
         # Send completion message
-        if q:
-            q.put({
-                "type": "done",
-                "status": "completed",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            })
+        on_message({
+            "type": "done",
+            "status": "completed",
+            "timestamp": iso_now(),
+        })
         
         RUNS[run_id] = {
             "status": "completed",
@@ -241,20 +461,21 @@ def _run_sync(work_dir: str, run_id: str, config: RunConfig) -> None:
             "artifact_report": artifact_report,
             "artifact_plot": artifact_plot,
             "artifacts": artifacts,
-            "started_at": start_time.isoformat() + "Z",
-            "completed_at": end_time.isoformat() + "Z",
+            "_artifact_index": _index_artifacts(artifacts),
+            "started_at": started_at,
+            "completed_at": completed_at,
             "duration_ms": duration_ms,
             "messages": result.get("messages", []),
-            "config": config.model_dump(),
+            "config": config_dict,
         }
         
         # Save to database
         save_run(
             run_id=run_id,
             status="completed",
-            config=config.model_dump(),
-            started_at=start_time.isoformat() + "Z",
-            completed_at=end_time.isoformat() + "Z",
+            config=config_dict,
+            started_at=started_at,
+            completed_at=completed_at,
             duration_ms=duration_ms,
             artifact_report=artifact_report,
             artifact_plot=artifact_plot,
@@ -262,24 +483,21 @@ def _run_sync(work_dir: str, run_id: str, config: RunConfig) -> None:
         
     except Exception as e:
         logger.warning("Run %s error: %s", run_id, e)
-        end_time = datetime.utcnow()
-        duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        completed_at = iso_now()
+        duration_ms = int((time.monotonic() - start_mono) * 1000)
 
         # Graceful degradation: check if artifacts were generated despite error
-        from cognitionflow.orchestration import discover_artifacts
         artifacts = discover_artifacts(work_dir) if os.path.isdir(work_dir) else []
 
         if artifacts:
             # Artifacts exist → mark as completed with warning
-            artifact_report = next((a["path"] for a in artifacts if a["path"].endswith(".md")), None)
-            artifact_plot = next((a["path"] for a in artifacts if a["path"].endswith(".png")), None)
+            artifact_report, artifact_plot = _primary_artifacts(artifacts)
 
-            if q:
-                q.put({
-                    "type": "done",
-                    "status": "completed",
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
-                })
+            on_message({
+                "type": "done",
+                "status": "completed",
+                "timestamp": iso_now(),
+            })
 
             RUNS[run_id] = {
                 "status": "completed",
@@ -287,39 +505,39 @@ def _run_sync(work_dir: str, run_id: str, config: RunConfig) -> None:
                 "artifact_report": artifact_report,
                 "artifact_plot": artifact_plot,
                 "artifacts": artifacts,
-                "started_at": start_time.isoformat() + "Z",
-                "completed_at": end_time.isoformat() + "Z",
+                "_artifact_index": _index_artifacts(artifacts),
+                "started_at": started_at,
+                "completed_at": completed_at,
                 "duration_ms": duration_ms,
                 "warning": str(e),
-                "config": config.model_dump(),
+                "config": config_dict,
             }
             save_run(
-                run_id=run_id, status="completed", config=config.model_dump(),
-                started_at=start_time.isoformat() + "Z",
-                completed_at=end_time.isoformat() + "Z",
+                run_id=run_id, status="completed", config=config_dict,
+                started_at=started_at,
+                completed_at=completed_at,
                 duration_ms=duration_ms,
                 artifact_report=artifact_report, artifact_plot=artifact_plot,
             )
         else:
             # No artifacts → true failure
-            if q:
-                q.put({
-                    "type": "done",
-                    "status": "failed",
-                    "error": str(e),
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
-                })
+            on_message({
+                "type": "done",
+                "status": "failed",
+                "error": str(e),
+                "timestamp": iso_now(),
+            })
 
             RUNS[run_id] = {
                 "status": "failed",
                 "error": str(e),
-                "started_at": start_time.isoformat() + "Z",
-                "failed_at": end_time.isoformat() + "Z",
-                "config": config.model_dump(),
+                "started_at": started_at,
+                "failed_at": completed_at,
+                "config": config_dict,
             }
             save_run(
-                run_id=run_id, status="failed", config=config.model_dump(),
-                started_at=start_time.isoformat() + "Z", error=str(e),
+                run_id=run_id, status="failed", config=config_dict,
+                started_at=started_at, error=str(e),
             )
     finally:
         # Aggressive memory cleanup after every run
@@ -328,16 +546,35 @@ def _run_sync(work_dir: str, run_id: str, config: RunConfig) -> None:
         logger.info("Run %s finished — memory: %.0f MB / %d MB cap", run_id, mem_mb, MEMORY_CAP_MB)
 
 
+# ============================================================================
+# Index Page (read once at import, revalidated by ETag)
+# ============================================================================
+def _load_index_html() -> bytes:
+    """Read the UI shell once so GET / never touches the disk."""
+    with open(os.path.join(_here, "static", "index.html"), "rb") as f:
+        return f.read()
+
+
+_INDEX_HTML = _load_index_html()
+_INDEX_ETAG = f'"{hashlib.md5(_INDEX_HTML).hexdigest()}"'
+
+
 # ============================================================================
 # FastAPI App
 # ============================================================================
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     load_env()
-    # Cleanup old workspaces on startup
-    cleanup_old_workspaces()
+    # One bounded worker pool for all runs (no per-request thread spin-up)
+    app.state.executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_RUNS, thread_name_prefix="cfworker"
+    )
+    # Cleanup old workspaces on startup, then sweep periodically off the request path
+    await asyncio.to_thread(cleanup_old_workspaces)
+    cleanup_task = asyncio.create_task(_periodic_workspace_cleanup())
     yield
-    # cleanup if any
+    cleanup_task.cancel()
+    app.state.executor.shutdown(wait=False)
 
 
 app = FastAPI(
@@ -361,10 +598,14 @@ app.add_middleware(
 # ============================================================================
 # API Endpoints
 # ============================================================================
-@app.get("/", response_class=FileResponse)
-def index():
+@app.get("/", response_class=HTMLResponse)
+def index(request: Request):
     """Minimal web UI: run analysis and view report/plot."""
-    return FileResponse(os.path.join(_here, "static", "index.html"))
+    # Browsers revalidate with If-None-Match; an unchanged page costs a bodiless 304
+    headers = {"ETag": _INDEX_ETAG}
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=_INDEX_HTML, headers=headers)
 
 
 @app.get("/health")
@@ -427,53 +668,45 @@ async def run_analysis(
             )
 
     # Check concurrent run limit
-    if run_semaphore.locked():
-        active_count = MAX_CONCURRENT_RUNS - run_semaphore._value
-        if active_count >= MAX_CONCURRENT_RUNS:
-            raise HTTPException(
-                status_code=503,
-                detail=f"Server busy. Max {MAX_CONCURRENT_RUNS} concurrent runs. Please try again."
-            )
-    
-    # Cleanup old workspaces on each run request
-    cleanup_old_workspaces()
+    if run_limiter.active_count >= run_limiter.limit:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy. Max {run_limiter.limit} concurrent runs. Please try again."
+        )
     
     config = config or RunConfig()
+    config_dict = config.model_dump()
     run_id = str(uuid.uuid4())
     base_dir = get_workspace_dir()
     work_dir = os.path.join(base_dir, run_id)
     os.makedirs(work_dir, exist_ok=True)
+    track_workspace(work_dir)
 
     # Create message queue for SSE streaming
-    RUN_QUEUES[run_id] = queue.Queue()
+    RUN_QUEUES[run_id] = asyncio.Queue(maxsize=RUN_QUEUE_MAXSIZE)
     
+    started_at = iso_now()
     RUNS[run_id] = {
         "status": "running",
         "work_dir": work_dir,
-        "started_at": datetime.utcnow().isoformat() + "Z",
+        "started_at": started_at,
         "messages": [],
         "current_phase": "initializing",
-        "config": config.model_dump(),
+        "config": config_dict,
     }
     
-    # Save initial run state
-    save_run(
-        run_id=run_id,
-        status="running",
-        config=config.model_dump(),
-        started_at=datetime.utcnow().isoformat() + "Z",
-    )
-    
-    async def run_with_semaphore():
-        async with run_semaphore:
-            # Run in thread pool to avoid blocking
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                await asyncio.get_event_loop().run_in_executor(
-                    executor, _run_sync, work_dir, run_id, config
-                )
+    async def run_with_limiter():
+        await run_limiter.acquire()
+        try:
+            # Run in the shared worker pool to avoid blocking the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                request.app.state.executor, _run_sync, work_dir, run_id, config, loop
+            )
+        finally:
+            await run_limiter.release()
     
-    background_tasks.add_task(lambda: asyncio.run(run_with_semaphore()))
+    background_tasks.add_task(run_with_limiter)
 
     return RunResponse(
         run_id=run_id,
@@ -486,8 +719,16 @@ async def run_analysis(
 def get_run(run_id: str):
     """Get status and artifact paths for a run."""
     # Check in-memory first
-    if run_id in RUNS:
-        return RUNS[run_id]
+    state = RUNS.get(run_id)
+    if state is not None:
+        if state.get("status") == "running":
+            return _public_state(state)
+        # Finished runs no longer change: encode the transcript once, serve the bytes after.
+        # The body lives on the state entry itself, so replacing or evicting the run drops it.
+        body = state.get("_response")
+        if body is None:
+            body = state["_response"] = _dumps(_public_state(state)).encode()
+        return Response(content=body, media_type="application/json")
         
     # Fallback to DB
     run_data = get_run_by_id(run_id)
@@ -495,11 +736,10 @@ def get_run(run_id: str):
         # Re-hydrate needed fields if necessary, or just return as is
         # Note: DB stores config as JSON string, need to ensure compatibility
         if run_data.get("config") and isinstance(run_data["config"], str):
-             import json
-             try:
-                 run_data["config"] = json.loads(run_data["config"])
-             except:
-                 pass
+            try:
+                run_data["config"] = json.loads(run_data["config"])
+            except ValueError:
+                pass
         return run_data
 
     raise HTTPException(status_code=404, detail="Run not found")
@@ -509,123 +749,127 @@ def get_run(run_id: str):
 @app.get("/runs/{run_id}/stream")
 async def stream_run(run_id: str):
     """SSE endpoint: stream agent messages in real-time."""
-    if run_id not in RUNS:
+    run_state = RUNS.get(run_id)
+    if run_state is None:
         raise HTTPException(status_code=404, detail="Run not found")
     
     q = RUN_QUEUES.get(run_id)
     if not q:
         # If run is already done, return final status immediately
-        run_state = RUNS.get(run_id, {})
         if run_state.get("status") in ("completed", "failed"):
             async def finished_generator():
                 yield {
                     "event": "done",
-                    "data": json.dumps({
+                    "data": _dumps({
                         "type": "done",
                         "status": run_state.get("status"),
-                        "timestamp": datetime.utcnow().isoformat() + "Z",
+                        "timestamp": iso_now(),
                     })
                 }
             return EventSourceResponse(finished_generator())
 
         raise HTTPException(status_code=404, detail="Run queue not found")
     
-    def _blocking_get(q, timeout):
-        """Wrapper so we can call q.get in a thread executor."""
-        try:
-            return q.get(timeout=timeout)
-        except queue.Empty:
-            return None
-
     async def event_generator():
-        loop = asyncio.get_event_loop()
         try:
             while True:
                 try:
-                    # Non-blocking queue read: run the blocking q.get in a
-                    # thread so the event-loop stays free to flush SSE chunks.
-                    msg = await loop.run_in_executor(
-                        None, _blocking_get, q, 1.0
-                    )
-
-                    if msg is None:
+                    # Await the queue directly: the event loop stays free to
+                    # flush SSE chunks while no message is pending.
+                    try:
+                        frame = await asyncio.wait_for(q.get(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        frame = None
+
+                    if frame is None:
                         # Timeout — check if run finished while we waited
                         run_state = RUNS.get(run_id, {})
                         if run_state.get("status") in ("completed", "failed"):
                             yield {
                                 "event": "done",
-                                "data": json.dumps({
+                                "data": _dumps({
                                     "type": "done",
                                     "status": run_state.get("status"),
-                                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                                    "timestamp": iso_now(),
                                 })
                             }
                             break
                         continue
 
-                    if msg.get("type") == "done":
-                        yield {
-                            "event": "done",
-                            "data": json.dumps(msg)
-                        }
+                    # Drain whatever else is already queued and flush the burst
+                    # as one chunk (one ASGI send instead of one per message).
+                    frames = [frame]
+                    while len(frames) < SSE_BATCH_MAX and not q.empty():
+                        frames.append(q.get_nowait())
+                    yield b"".join(
+                        ServerSentEvent(data=data, event=event_type).encode()
+                        for event_type, data in frames
+                    )
+                    # "done" is always the last frame a run enqueues
+                    if frames[-1][0] == "done":
                         break
-
-                    yield {
-                        "event": "message",
-                        "data": json.dumps(msg)
-                    }
                 except Exception as e:
                     yield {
                         "event": "error",
-                        "data": json.dumps({"error": str(e)})
+                        "data": _dumps({"error": str(e)})
                     }
                     break
         finally:
-            # Cleanup queue when done
-            if run_id in RUN_QUEUES:
-                del RUN_QUEUES[run_id]
+            # Cleanup queue when done (eviction may already have dropped it)
+            RUN_QUEUES.pop(run_id, None)
     
     return EventSourceResponse(event_generator())
 
 
+_MEDIA_TYPES = {
+    ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+    ".md": "text/markdown", ".json": "application/json", ".txt": "text/plain",
+    ".html": "text/html", ".csv": "text/csv", ".py": "text/x-python",
+}
+# Artifacts of a completed run never change and are deleted after CLEANUP_AGE_HOURS
+_ARTIFACT_CACHE_CONTROL = f"private, max-age={CLEANUP_AGE_HOURS * 3600}, immutable"
+
+
+def _artifact_response(path: str, media_type: str) -> FileResponse:
+    """FileResponse (ETag/Last-Modified, sendfile when the server supports it) + client caching."""
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": _ARTIFACT_CACHE_CONTROL})
+
+
 @app.get("/runs/{run_id}/incident_report")
 def get_incident_report(run_id: str):
     """Serve incident_report.md for a run."""
-    if run_id not in RUNS or RUNS[run_id].get("status") != "completed":
+    state = RUNS.get(run_id)
+    if state is None or state.get("status") != "completed":
         raise HTTPException(status_code=404, detail="Run not found or not completed")
-    path = RUNS[run_id].get("artifact_report")
+    path = state.get("artifact_report")
     if not path or not os.path.isfile(path):
         raise HTTPException(status_code=404, detail="Artifact not found")
-    return FileResponse(path, media_type="text/markdown")
+    return _artifact_response(path, "text/markdown")
 
 
 @app.get("/runs/{run_id}/server_health.png")
 def get_server_health_plot(run_id: str):
     """Serve server_health.png for a run (backward compat)."""
-    if run_id not in RUNS or RUNS[run_id].get("status") != "completed":
+    state = RUNS.get(run_id)
+    if state is None or state.get("status") != "completed":
         raise HTTPException(status_code=404, detail="Run not found or not completed")
-    path = RUNS[run_id].get("artifact_plot")
+    path = state.get("artifact_plot")
     if not path or not os.path.isfile(path):
         raise HTTPException(status_code=404, detail="Artifact not found")
-    return FileResponse(path, media_type="image/png")
+    return _artifact_response(path, "image/png")
 
 
 @app.get("/runs/{run_id}/artifacts/{filename:path}")
 def get_run_artifact(run_id: str, filename: str):
     """Serve any discovered artifact by name (dynamic artifact discovery)."""
-    if run_id not in RUNS or RUNS[run_id].get("status") != "completed":
+    state = RUNS.get(run_id)
+    if state is None or state.get("status") != "completed":
         raise HTTPException(status_code=404, detail="Run not found or not completed")
-    artifacts = RUNS[run_id].get("artifacts", [])
-    for a in artifacts:
-        if os.path.basename(a.get("path", "")) == filename or a.get("name") == filename:
-            path = a["path"]
-            if os.path.isfile(path):
-                ext = os.path.splitext(filename)[1].lower()
-                media_types = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-                               ".md": "text/markdown", ".json": "application/json", ".txt": "text/plain",
-                               ".html": "text/html", ".csv": "text/csv", ".py": "text/x-python"}
-                return FileResponse(path, media_type=media_types.get(ext, "application/octet-stream"))
-    raise HTTPException(status_code=404, detail="Artifact not found")
+    path = state.get("_artifact_index", {}).get(filename)
+    if not path or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    ext = os.path.splitext(filename)[1].lower()
+    return _artifact_response(path, _MEDIA_TYPES.get(ext, "application/octet-stream"))
 
 
 @app.get("/history")
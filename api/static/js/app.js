@@ -1,15 +1,19 @@
 
 document.addEventListener('DOMContentLoaded', () => {
-    // DOM Elements
-    const form = document.getElementById('runForm');
-    const runBtn = document.getElementById('runBtn');
-    const msgContainer = document.getElementById('msgContainer');
-    const scrollAnchor = document.getElementById('scrollAnchor');
-    const connectionStatus = document.getElementById('connectionStatus');
-    const tempInput = document.getElementById('temperature');
-    const tempValue = document.getElementById('tempValue');
-    const agentPlan = document.getElementById('agentPlan');
-    const agentPlanText = document.getElementById('agentPlanText');
+    // DOM Elements (resolved once; reused by every handler below)
+    const el = Object.fromEntries([
+        'runForm', 'runBtn', 'msgContainer', 'scrollAnchor', 'connectionStatus',
+        'temperature', 'tempValue', 'agentPlan', 'agentPlanText',
+        'model', 'template_id', 'agent_mode', 'output_format',
+        'artifactsContainer', 'artifactsList', 'clearBtn',
+    ].map(id => [id, document.getElementById(id)]));
+    const {
+        runForm: form, runBtn, msgContainer, scrollAnchor, connectionStatus,
+        temperature: tempInput, tempValue, agentPlan, agentPlanText,
+        model: modelSelect, template_id: templateSelect,
+        agent_mode: modeSelect, output_format: outputSelect,
+        artifactsContainer, artifactsList, clearBtn,
+    } = el;
 
     // Config Data State
     let configData = null;
@@ -43,7 +47,6 @@ document.addEventListener('DOMContentLoaded', () => {
     // 2. Populate Dropdowns
     function populateOptions(data) {
         // Models
-        const modelSelect = document.getElementById('model');
         data.models.forEach(m => {
             const opt = document.createElement('option');
             opt.value = m.id;
@@ -53,7 +56,6 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         // Templates
-        const templateSelect = document.getElementById('template_id');
         data.task_templates.forEach(t => {
             const opt = document.createElement('option');
             opt.value = t.id;
@@ -64,7 +66,6 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         // Agent Modes
-        const modeSelect = document.getElementById('agent_mode');
         data.agent_modes.forEach(m => {
             const opt = document.createElement('option');
             opt.value = m.id;
@@ -74,7 +75,6 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         // Output Formats
-        const outputSelect = document.getElementById('output_format');
         data.output_formats.forEach(f => {
             const opt = document.createElement('option');
             opt.value = f.id;
@@ -82,6 +82,9 @@ document.addEventListener('DOMContentLoaded', () => {
             if (f.id === data.defaults.output_format) opt.selected = true;
             outputSelect.appendChild(opt);
         });
+
+        // Filling the selects in code fires no input/change event
+        invalidatePayload();
     }
 
     // 3. UX Interactions
@@ -91,12 +94,12 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     // Update Plan Preview on Selection Change
-    document.getElementById('template_id').addEventListener('change', updatePlanPreview);
+    templateSelect.addEventListener('change', updatePlanPreview);
 
     function updatePlanPreview() {
         if (!configData) return;
 
-        const templateId = document.getElementById('template_id').value;
+        const templateId = templateSelect.value;
         const template = configData.task_templates.find(t => t.id === templateId);
 
         if (template) {
@@ -108,13 +111,35 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // 4. Handle Form Submission
+    // Payload is rebuilt only after the form changes (repeat runs reuse it)
+    let cachedPayload = null;
+    const invalidatePayload = () => { cachedPayload = null; };
+    form.addEventListener('input', invalidatePayload, { passive: true });
+    form.addEventListener('change', invalidatePayload);
+
+    function buildPayload() {
+        if (cachedPayload) return cachedPayload;
+        const formData = new FormData(form);
+        const payload = {
+            template_id: formData.get('template_id'),
+            task_prompt: formData.get('task_prompt') || null,
+            model: formData.get('model'),
+            temperature: parseFloat(formData.get('temperature')),
+            agent_mode: formData.get('agent_mode'),
+            output_format: formData.get('output_format'),
+        };
+        // Until /config loads the selects are empty; don't pin that payload
+        if (configData) cachedPayload = payload;
+        return payload;
+    }
+
     form.addEventListener('submit', async (e) => {
         e.preventDefault();
 
         // Clear previous runs and welcome state
         msgContainer.innerHTML = '';
-        document.getElementById('artifactsContainer').classList.add('hidden');
-        document.getElementById('artifactsList').innerHTML = '';
+        artifactsContainer.classList.add('hidden');
+        artifactsList.innerHTML = '';
 
 
 
@@ -123,16 +148,7 @@ document.addEventListener('DOMContentLoaded', () => {
         runBtn.innerHTML = '<span>Initializing Workflow...</span>';
         connectionStatus.textContent = 'Pipeline Active';
 
-        // Build Payload
-        const formData = new FormData(form);
-        const payload = {
-            template_id: formData.get('template_id'),
-            task_prompt: formData.get('task_prompt') || null,
-            model: formData.get('model'),
-            temperature: parseFloat(formData.get('temperature')),
-            agent_mode: formData.get('agent_mode'),
-            output_format: formData.get('output_format'),
-        };
+        const payload = buildPayload();
 
         try {
             // Start Run
@@ -163,10 +179,10 @@ document.addEventListener('DOMContentLoaded', () => {
     function connectStream(runId) {
         const eventSource = new EventSource(`/runs/${runId}/stream`);
 
-        eventSource.addEventListener('message', (e) => {
-            const msg = JSON.parse(e.data);
-            renderMessage(msg);
-        });
+        // Server emits one SSE event name per message type; 'message' is the fallback
+        const onAgentEvent = (e) => renderMessage(JSON.parse(e.data));
+        ['phase_change', 'agent_message', 'code_generation', 'code_execution', 'review_approved', 'message']
+            .forEach(type => eventSource.addEventListener(type, onAgentEvent));
 
         eventSource.addEventListener('done', (e) => {
             const data = JSON.parse(e.data);
@@ -262,9 +278,6 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!res.ok) return;
             const data = await res.json();
 
-            const artifactsContainer = document.getElementById('artifactsContainer');
-            const artifactsList = document.getElementById('artifactsList');
-
             if (data.artifacts && data.artifacts.length > 0) {
                 artifactsContainer.classList.remove('hidden');
                 artifactsList.innerHTML = ''; // Clear old ones
@@ -315,7 +328,6 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Cleanup Clear Button
-    const clearBtn = document.getElementById('clearBtn');
     if (clearBtn) {
         clearBtn.addEventListener('click', () => {
             msgContainer.innerHTML = '';
@@ -2,6 +2,8 @@
 CognitionFlow: Multi-agent pipeline with review loop.
 Three-agent architecture: Executor, Engineer, Reviewer.
 """
+import importlib
+
 from cognitionflow.config import get_config, load_env
 
 __all__ = [
@@ -13,14 +15,18 @@ __all__ = [
 ]
 
 
+# Lazily imported (pull in autogen): attribute name -> defining module
+_LAZY = {
+    "build_agents": "cognitionflow.agents",
+    "run_workflow": "cognitionflow.orchestration",
+    "get_template_prompt": "cognitionflow.orchestration",
+}
+
+
 def __getattr__(name):
-    if name == "build_agents":
-        from cognitionflow.agents import build_agents
-        return build_agents
-    if name == "run_workflow":
-        from cognitionflow.orchestration import run_workflow
-        return run_workflow
-    if name == "get_template_prompt":
-        from cognitionflow.orchestration import get_template_prompt
-        return get_template_prompt
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Cache so later lookups bypass __getattr__
+    return value
@@ -2,7 +2,7 @@
 AutoGen agent team: Executor (proxy), Engineer (assistant), Reviewer (assistant).
 Three-agent architecture with review loop for quality assurance.
 """
-import autogen
+from types import MappingProxyType
 
 from cognitionflow.config import get_config, get_workspace_dir
 
@@ -11,7 +11,8 @@ from cognitionflow.config import get_config, get_workspace_dir
 # System Prompts
 # ============================================================================
 
-ENGINEER_PROMPTS = {
+# Read-only view: one shared copy of each prompt, never mutated at runtime
+ENGINEER_PROMPTS = MappingProxyType({
     "standard": """You are a Principal Software Engineer.
 Write clean, production-quality Python code to solve the assigned task.
 
@@ -64,7 +65,7 @@ Write clean, production-quality Python code to solve the assigned task.
 - Do NOT write TERMINATE or PIPELINE_COMPLETE.
 - Reviewer handles completion. Fix issues if flagged.
 """,
-}
+})
 
 
 REVIEWER_PROMPT = """You are a Senior Code Reviewer and QA Engineer for the CognitionFlow pipeline.
@@ -120,6 +121,36 @@ def is_pipeline_complete(msg: dict) -> bool:
     return "PIPELINE_COMPLETE" in content
 
 
+# ============================================================================
+# History Trimming
+# ============================================================================
+
+EXECUTION_OUTPUT_KEEP_LINES = 25  # Head/tail lines of executor output re-sent to the LLM
+
+
+def trim_execution_output(messages: list[dict]) -> list[dict]:
+    """
+    Elide the middle of long code-execution outputs before an agent replies.
+    Runs as a process_all_messages_before_reply hook: the agent's stored
+    history (and the SSE stream) keep the full text. Only messages that start
+    with "exitcode:" (UserProxyAgent's execution report) are touched, so code
+    that merely mentions an exit code is never cut.
+    """
+    keep = EXECUTION_OUTPUT_KEEP_LINES
+    trimmed = []
+    for msg in messages:
+        content = msg.get("content")
+        if isinstance(content, str) and content.startswith("exitcode:") and content.count("\n") > 2 * keep:
+            lines = content.splitlines()
+            elided = len(lines) - 2 * keep
+            msg = {
+                **msg,
+                "content": "\n".join(lines[:keep] + [f"... <{elided} lines elided> ..."] + lines[-keep:]),
+            }
+        trimmed.append(msg)
+    return trimmed
+
+
 # ============================================================================
 # Agent Builder
 # ============================================================================
@@ -140,6 +171,8 @@ def build_agents(
     Returns:
         tuple of (executor, engineer, reviewer)
     """
+    import autogen  # Deferred: importing prompts/predicates shouldn't pull in autogen
+
     work_dir = work_dir or get_workspace_dir()
     llm_config = llm_config or get_config()
 
@@ -170,4 +203,10 @@ def build_agents(
         llm_config=llm_config,
     )
 
+    # Bound per-turn context: long stdout dumps are re-sent on every later turn.
+    # LLM speakers only: the Executor's code-execution reply reads the hooked
+    # messages, so trimming there would alter the code it runs.
+    for agent in (engineer, reviewer):
+        agent.register_hook("process_all_messages_before_reply", trim_execution_output)
+
     return executor, engineer, reviewer
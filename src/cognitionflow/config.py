@@ -1,17 +1,14 @@
 """
 Configuration from environment. Supports Groq and OpenAI.
 """
+import functools
 import os
-
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+from types import MappingProxyType
 
 
+@functools.lru_cache(maxsize=1)
 def load_env() -> None:
-    """Load .env if python-dotenv is available. Idempotent."""
+    """Load .env if python-dotenv is available. Parsed once per process (load_env.cache_clear() to reload)."""
     try:
         from dotenv import load_dotenv
         load_dotenv()
@@ -19,36 +16,60 @@ def load_env() -> None:
         pass
 
 
+load_env()
+
+
+def _llm_cache_seed() -> int | None:
+    """
+    AutoGen DiskCache seed for LLM responses (identical requests are replayed from disk).
+    COGNITIONFLOW_PROMPT_CACHE=off disables the cache; an integer selects a separate cache.
+    """
+    value = os.environ.get("COGNITIONFLOW_PROMPT_CACHE", "41").strip().lower()
+    if value in ("off", "none", "false"):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f"COGNITIONFLOW_PROMPT_CACHE must be an integer seed or 'off', got {value!r}"
+        ) from None
+
+
 def get_config() -> dict:
     """
     Build LLM config from environment.
     Prefers GROQ_API_KEY (Groq). Falls back to OPENAI_API_KEY (OpenAI).
     """
     load_env()
-    api_key = os.environ.get("GROQ_API_KEY") or os.environ.get("OPENAI_API_KEY")
+    env = os.environ
+    groq_key = env.get("GROQ_API_KEY")
+    api_key = groq_key or env.get("OPENAI_API_KEY")
     if not api_key:
         raise ValueError(
             "Set GROQ_API_KEY or OPENAI_API_KEY in environment or .env"
         )
 
-    if os.environ.get("GROQ_API_KEY"):
+    if groq_key:
         return {
             "config_list": [{
-                "model": os.environ.get("GROQ_MODEL", "llama-3.1-8b-instant"),
+                "model": env.get("GROQ_MODEL", "llama-3.1-8b-instant"),
                 "api_key": api_key,
                 "base_url": "https://api.groq.com/openai/v1",
             }],
-            "temperature": float(os.environ.get("GROQ_TEMPERATURE", "0.1")),
-            "timeout": int(os.environ.get("GROQ_TIMEOUT", "600")),
+            "temperature": float(env.get("GROQ_TEMPERATURE", "0.1")),
+            "timeout": int(env.get("GROQ_TIMEOUT", "600")),
+            "cache_seed": _llm_cache_seed(),
         }
     # OpenAI
-    entry = {"model": os.environ.get("OPENAI_MODEL", "gpt-4o"), "api_key": api_key}
-    if os.environ.get("OPENAI_BASE_URL"):
-        entry["base_url"] = os.environ["OPENAI_BASE_URL"]
+    entry = {"model": env.get("OPENAI_MODEL", "gpt-4o"), "api_key": api_key}
+    base_url = env.get("OPENAI_BASE_URL")
+    if base_url:
+        entry["base_url"] = base_url
     return {
         "config_list": [entry],
-        "temperature": float(os.environ.get("OPENAI_TEMPERATURE", "0.1")),
-        "timeout": int(os.environ.get("OPENAI_TIMEOUT", "600")),
+        "temperature": float(env.get("OPENAI_TEMPERATURE", "0.1")),
+        "timeout": int(env.get("OPENAI_TIMEOUT", "600")),
+        "cache_seed": _llm_cache_seed(),
     }
 
 
@@ -61,25 +82,30 @@ def get_workspace_dir() -> str:
 # ============================================================================
 # Available models for user selection
 # ============================================================================
+# Option tables are read-only: tuples of mapping proxies, shared by all requests
+
+def _freeze(items: list[dict]) -> tuple[MappingProxyType, ...]:
+    return tuple(MappingProxyType(item) for item in items)
+
 
-AVAILABLE_MODELS = [
+AVAILABLE_MODELS = _freeze([
     {"id": "llama-3.3-70b-versatile", "name": "Llama 3.3 70B", "description": "Most capable & versatile"},
     {"id": "llama-3.1-8b-instant", "name": "Llama 3.1 8B", "description": "Fastest response"},
     {"id": "openai/gpt-oss-120b", "name": "GPT-OSS 120B", "description": "High reasoning capability"},
     {"id": "qwen/qwen3-32b", "name": "Qwen 3 32B", "description": "Strong open model"},
-]
+])
 
-AGENT_MODES = [
+AGENT_MODES = _freeze([
     {"id": "standard", "name": "Standard", "description": "Balanced output with code + brief context"},
     {"id": "detailed", "name": "Detailed", "description": "Verbose with explanations and comments"},
     {"id": "concise", "name": "Concise", "description": "Minimal output, code only"},
-]
+])
 
 # ============================================================================
 # Pre-built task templates
 # ============================================================================
 
-TASK_TEMPLATES = [
+TASK_TEMPLATES = _freeze([
     {
         "id": "data_analysis",
         "name": "Data Analysis",
@@ -168,19 +194,19 @@ TASK_TEMPLATES = [
 **Requirements:** Production-ready code with proper error handling, type hints, and docstrings.""",
         "output_files": ["api_app.py", "api_docs.md"],
     },
-]
+])
 
 # ============================================================================
 # Output format options
 # ============================================================================
 
-OUTPUT_FORMATS = [
+OUTPUT_FORMATS = _freeze([
     {"id": "markdown", "name": "Markdown", "description": "Structured text report (.md)"},
     {"id": "json", "name": "JSON", "description": "Structured data output (.json)"},
     {"id": "code", "name": "Code", "description": "Python source file (.py)"},
     {"id": "plot", "name": "Visualization", "description": "Chart/plot image (.png)"},
     {"id": "auto", "name": "Auto", "description": "Let agent decide based on task"},
-]
+])
 
 
 # ============================================================================
@@ -3,28 +3,40 @@ Run the multi-agent workflow with review loop.
 Three agents (Executor, Engineer, Reviewer) collaborate via GroupChat.
 The Reviewer validates the Engineer's output before approving completion.
 """
-import gc
+import functools
 import os
 import re
-import glob
 import logging
-from datetime import datetime
+import time
+from types import MappingProxyType
 from typing import Callable, Optional
 
-import autogen
-
 logger = logging.getLogger(__name__)
 
 from cognitionflow.config import get_config, get_workspace_dir, get_config_with_overrides, TASK_TEMPLATES
 from cognitionflow.agents import build_agents, is_pipeline_complete
 
 
+_TEMPLATE_PROMPTS: dict[str, str] = {t["id"]: t["prompt"] for t in TASK_TEMPLATES}
+_DEFAULT_TEMPLATE_PROMPT = TASK_TEMPLATES[0]["prompt"] if TASK_TEMPLATES else ""
+
+
 def get_template_prompt(template_id: str) -> str:
-    """Get the prompt for a task template by ID."""
-    for template in TASK_TEMPLATES:
-        if template["id"] == template_id:
-            return template["prompt"]
-    return TASK_TEMPLATES[0]["prompt"] if TASK_TEMPLATES else ""
+    """Get the prompt for a task template by ID (falls back to the first template)."""
+    return _TEMPLATE_PROMPTS.get(template_id, _DEFAULT_TEMPLATE_PROMPT)
+
+
+_EXT_TO_TYPE = MappingProxyType({
+    "png": "image",
+    "jpg": "image",
+    "jpeg": "image",
+    "md": "markdown",
+    "json": "json",
+    "py": "code",
+    "txt": "text",
+    "csv": "data",
+    "html": "html",
+})
 
 
 def discover_artifacts(work_dir: str) -> list[dict]:
@@ -33,27 +45,23 @@ def discover_artifacts(work_dir: str) -> list[dict]:
     Returns a list of dicts with path, type, and name.
     """
     artifacts = []
-    extensions = {
-        ".png": "image",
-        ".jpg": "image",
-        ".jpeg": "image",
-        ".md": "markdown",
-        ".json": "json",
-        ".py": "code",
-        ".txt": "text",
-        ".csv": "data",
-        ".html": "html",
-    }
-
-    for filepath in glob.glob(os.path.join(work_dir, "*")):
-        if os.path.isfile(filepath):
-            ext = os.path.splitext(filepath)[1].lower()
-            file_type = extensions.get(ext, "file")
-            artifacts.append({
-                "path": filepath,
-                "name": os.path.basename(filepath),
-                "type": file_type,
-            })
+    try:
+        entries = os.scandir(work_dir)
+    except OSError:
+        return artifacts
+
+    # One directory read; DirEntry.is_file() uses d_type instead of a stat per file.
+    # Symlinks are skipped: generated code must not expose files outside work_dir.
+    with entries:
+        for entry in entries:
+            if not entry.name.startswith(".") and entry.is_file(follow_symlinks=False):
+                name = entry.name
+                _, dot, ext = name.rpartition(".")
+                artifacts.append({
+                    "path": entry.path,
+                    "name": name,
+                    "type": _EXT_TO_TYPE.get(ext.lower(), "file") if dot else "file",
+                })
 
     return artifacts
 
@@ -62,10 +70,28 @@ def discover_artifacts(work_dir: str) -> list[dict]:
 # Message Utilities
 # ============================================================================
 
+_CODE_BLOCK_RE = re.compile(r"```python\n(.*?)\n```", re.DOTALL)
+
+
 def _extract_code_blocks(content: str) -> list[str]:
     """Extract Python code blocks from markdown."""
-    pattern = r"```python\n(.*?)\n```"
-    return re.findall(pattern, content, re.DOTALL)
+    if "```python" not in content:
+        return []  # No Python fence (prose, ACKs, execution output): skip the regex engine
+    return _CODE_BLOCK_RE.findall(content)
+
+
+@functools.lru_cache(maxsize=4)
+def _utc_second_prefix(seconds: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def iso_now() -> str:
+    """Current UTC time as ISO-8601 with a 'Z' suffix; the per-second prefix is cached."""
+    seconds, ns = divmod(time.time_ns(), 1_000_000_000)
+    return f"{_utc_second_prefix(seconds)}.{ns // 1000:06d}Z"
+
+
+_TYPE_MARKER_RE = re.compile(r"((?i:exitcode:))|PIPELINE_COMPLETE")
 
 
 def _make_message_dict(sender: str, receiver: str, content: str) -> dict:
@@ -73,13 +99,13 @@ def _make_message_dict(sender: str, receiver: str, content: str) -> dict:
     code_blocks = _extract_code_blocks(content)
     has_code = len(code_blocks) > 0
 
-    msg_type = "agent_message"
-    if has_code:
-        msg_type = "code_generation"
-    if "PIPELINE_COMPLETE" in content:
+    # One scan for both markers; precedence: execution > approval > code > plain
+    msg_type = "code_generation" if has_code else "agent_message"
+    for match in _TYPE_MARKER_RE.finditer(content):
+        if match.group(1):
+            msg_type = "code_execution"
+            break
         msg_type = "review_approved"
-    if "exitcode:" in content.lower():
-        msg_type = "code_execution"
 
     return {
         "type": msg_type,
@@ -87,7 +113,7 @@ def _make_message_dict(sender: str, receiver: str, content: str) -> dict:
         "sender": sender,
         "receiver": receiver,
         "content": content,
-        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "timestamp": iso_now(),
         "has_code": has_code,
         "code_blocks": code_blocks,
     }
@@ -121,6 +147,8 @@ def run_workflow(
     Returns:
         dict with result, work_dir, artifacts, and messages
     """
+    import autogen  # Deferred: template/artifact helpers (and the API at startup) don't need it
+
     if not task_prompt:
         task_prompt = get_template_prompt("data_analysis")
 
@@ -139,8 +167,6 @@ def run_workflow(
     engineer.clear_history()
     reviewer.clear_history()
 
-    streamed_messages: list[dict] = []
-
     # Send initialization phase change
     if on_message:
         try:
@@ -148,7 +174,7 @@ def run_workflow(
                 "type": "phase_change",
                 "phase": "initializing",
                 "message": f"Initializing fresh agent instance (Session: {os.path.basename(work_dir)[:8]})...",
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": iso_now(),
             })
         except Exception:
             pass
@@ -214,7 +240,8 @@ def run_workflow(
     #   - Initial task prompt (executor → manager)
     #   - Each speaker reply  (speaker.send(reply, manager))
     # This is the single choke-point for all inbound messages.
-    streamed_keys: set = set()
+    # Dedup key -> streamed message dict (insertion-ordered; reused for the return value)
+    streamed_messages: dict[tuple[str, int], dict] = {}
 
     if on_message:
         _original_process = manager._process_received_message
@@ -229,14 +256,17 @@ def run_workflow(
                 content = message
             else:
                 content = ""
-            name = getattr(sender, "name", "Unknown")
-            if not content:
+            # Nothing to show (tool calls, multimodal parts, blank replies): skip before
+            # building the dict or touching the dedup set
+            if not content or not isinstance(content, str) or content.isspace():
                 return
-            key = f"{name}:{content[:80]}"
-            if key in streamed_keys:
+            name = getattr(sender, "name", "Unknown")
+            # Full-content hash: outputs sharing a long prefix (e.g. "exitcode: 0 ...")
+            # are distinct messages; str hashes are cached on the object
+            key = (name, hash(content))
+            if key in streamed_messages:
                 return
-            streamed_keys.add(key)
-            msg_dict = _make_message_dict(name, "GroupChat", content)
+            msg_dict = streamed_messages[key] = _make_message_dict(name, "GroupChat", content)
             try:
                 on_message(msg_dict)
             except Exception:
@@ -259,36 +289,38 @@ def run_workflow(
                     "type": "phase_change",
                     "phase": "warning",
                     "message": f"Agent conversation ended early: {type(chat_err).__name__}",
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
+                    "timestamp": iso_now(),
                 })
             except Exception:
                 pass
 
     # Collect all messages for the return value
-    # Access the *copy* that run_chat used via the manager's reply func list
-    gc_messages = groupchat.messages
-    for entry in getattr(manager, "_reply_func_list", []):
-        cfg = entry.get("config")
-        if cfg is not None and hasattr(cfg, "messages") and cfg.messages:
-            gc_messages = cfg.messages
-            break
-
+    # register_reply's copy.copy is shallow, so the copy run_chat used normally
+    # shares this messages list; walk the reply func list only if it is empty.
+    gc_messages = groupchat.messages or next(
+        (
+            entry["config"].messages
+            for entry in getattr(manager, "_reply_func_list", ())
+            if getattr(entry.get("config"), "messages", None)
+        ),
+        groupchat.messages,
+    )
+    # The transcript keeps order and repeated turns; reuse each streamed dict once
+    # (first occurrence) and build dicts only for the rest
+    unclaimed = dict(streamed_messages)
     final_messages = []
     for item in gc_messages:
-        if isinstance(item, dict) and item.get("content"):
-            final_messages.append(
-                _make_message_dict(
-                    sender=item.get("name", item.get("role", "System")),
-                    receiver="GroupChat",
-                    content=item["content"],
-                )
-            )
+        if not isinstance(item, dict) or not item.get("content"):
+            continue
+        sender = item.get("name", item.get("role", "System"))
+        content = item["content"]
+        msg_dict = unclaimed.pop((sender, hash(content)), None) if isinstance(content, str) else None
+        if msg_dict is None:
+            msg_dict = _make_message_dict(sender=sender, receiver="GroupChat", content=content)
+        final_messages.append(msg_dict)
 
     artifacts = discover_artifacts(work_dir)
 
-    # Force garbage collection to free LLM response caches
-    gc.collect()
-
     return {
         "result": result,
         "work_dir": work_dir,
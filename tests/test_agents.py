@@ -0,0 +1,48 @@
+"""Agent tests - verify history trimming and the team build."""
+
+
+def test_trim_execution_output_elides_long_outputs():
+    """Long execution outputs keep head and tail; other messages are untouched."""
+    from cognitionflow.agents import EXECUTION_OUTPUT_KEEP_LINES, trim_execution_output
+
+    keep = EXECUTION_OUTPUT_KEEP_LINES
+    lines = [f"line {i}" for i in range(3 * keep)]
+    long_output = {"role": "user", "content": "exitcode: 0 (execution succeeded)\n" + "\n".join(lines)}
+    chat = {"role": "assistant", "content": "\n".join(lines)}
+    messages = [chat, long_output]
+
+    trimmed = trim_execution_output(messages)
+
+    assert trimmed[0] is chat
+    content = trimmed[1]["content"]
+    assert content.startswith("exitcode: 0")
+    assert content.endswith(lines[-1])
+    assert f"<{3 * keep + 1 - 2 * keep} lines elided>" in content
+    # Stored history is not mutated
+    assert messages[1] is long_output and "line 40" in long_output["content"]
+
+
+def test_trim_execution_output_keeps_code_mentioning_exitcode():
+    """A long Engineer reply that mentions exitcode: is code to run, not output to trim."""
+    from cognitionflow.agents import EXECUTION_OUTPUT_KEEP_LINES, trim_execution_output
+
+    code = "\n".join(f"print({i})" for i in range(3 * EXECUTION_OUTPUT_KEEP_LINES))
+    reply = {
+        "role": "assistant",
+        "name": "Engineer",
+        "content": f"The last run failed with exitcode: 1, fixed version:\n```python\n{code}\n```",
+    }
+
+    assert trim_execution_output([reply]) == [reply]
+
+
+def test_build_agents_registers_trim_hook(tmp_path):
+    """build_agents wires the trimming hook into the LLM speakers, not the Executor."""
+    from cognitionflow.agents import build_agents, trim_execution_output
+
+    llm_config = {"config_list": [{"model": "test-model", "api_key": "test"}]}
+    executor, engineer, reviewer = build_agents(work_dir=str(tmp_path), llm_config=llm_config)
+
+    for agent in (engineer, reviewer):
+        assert trim_execution_output in agent.hook_lists["process_all_messages_before_reply"]
+    assert trim_execution_output not in executor.hook_lists["process_all_messages_before_reply"]
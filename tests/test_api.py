@@ -12,13 +12,15 @@ if _src not in sys.path:
 
 
 def test_imports_succeed():
-    """Critical: verify all modules can be imported (catches missing deps like autogen)."""
+    """Critical: verify all modules and runtime deps import (catches missing deps like autogen)."""
     # These imports would fail if dependencies are missing
     from cognitionflow import config
     from cognitionflow import orchestration
-    from cognitionflow import agents  # This imports autogen
+    from cognitionflow import agents
     from api import main
     from api import db
+    # agents/orchestration defer autogen to build_agents/run_workflow, so import it explicitly
+    import autogen
 
 
 def test_health_endpoint():
@@ -59,7 +61,7 @@ def test_config_endpoint():
 
 
 def test_index_serves_html():
-    """Index route serves the frontend HTML."""
+    """Index route serves the frontend HTML and honours its ETag."""
     from fastapi.testclient import TestClient
     from api.main import app
     
@@ -68,6 +70,11 @@ def test_index_serves_html():
     
     assert response.status_code == 200
     assert "text/html" in response.headers.get("content-type", "")
+    # Revalidation with the served ETag skips the body
+    etag = response.headers["etag"]
+    cached = client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
 
 
 def test_nonexistent_run_returns_404():
@@ -79,3 +86,142 @@ def test_nonexistent_run_returns_404():
     response = client.get("/runs/nonexistent-run-id")
     
     assert response.status_code == 404
+
+
+def test_rate_limit_blocks_after_max():
+    """check_rate_limit allows RATE_LIMIT_MAX requests per IP, then rejects."""
+    from api import main
+
+    ip = "203.0.113.7"
+    main._rate_limit_shard(ip)[0].pop(ip, None)
+    allowed = [main.check_rate_limit(ip) for _ in range(main.RATE_LIMIT_MAX)]
+    assert all(allowed)
+    assert main.check_rate_limit(ip) is False
+    # Other clients are unaffected
+    assert main.check_rate_limit("203.0.113.8") is True
+
+
+def test_rate_limit_store_is_bounded():
+    """Rate-limit shards evict the least recently updated IP past its cap."""
+    from api.main import _BoundedIPStore
+
+    store = _BoundedIPStore(maxsize=2)
+    store["a"] = 1.0
+    store["b"] = 2.0
+    store["a"] = 3.0  # refresh "a" so "b" becomes the stalest
+    store["c"] = 4.0
+    assert list(store) == ["a", "c"]
+
+
+def test_run_store_evicts_finished_runs_only():
+    """_RunStore drops the stalest finished run and keeps running ones."""
+    from api.main import _RunStore
+
+    store = _RunStore(maxsize=2)
+    store["a"] = {"status": "running"}
+    store["b"] = {"status": "completed"}
+    store["c"] = {"status": "completed"}
+    assert list(store) == ["a", "c"]
+
+
+def test_run_store_concurrent_writes_stay_bounded():
+    """Concurrent writers (event loop + worker pool) never corrupt eviction."""
+    import threading
+    from api.main import _RunStore
+
+    store = _RunStore(maxsize=8)
+
+    def writer(prefix):
+        for i in range(2000):
+            store[f"{prefix}{i}"] = {"status": "completed"}
+
+    threads = [threading.Thread(target=writer, args=(p,)) for p in "abcd"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store) == 8
+
+
+def test_run_limiter_tracks_active_runs():
+    """RunLimiter counts admitted runs and frees the slot on release."""
+    import asyncio
+    from api.main import RunLimiter
+
+    async def scenario():
+        limiter = RunLimiter(limit=1)
+        await limiter.acquire()
+        assert limiter.active_count == 1
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await limiter.release()
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert limiter.active_count == 1
+
+    asyncio.run(scenario())
+
+
+def test_run_streams_messages_and_completes(monkeypatch, tmp_path):
+    """POST /run executes the workflow in the background and the SSE stream replays it."""
+    from fastapi.testclient import TestClient
+    from api import main
+
+    def fake_run_workflow(task_prompt, work_dir, on_message, **kwargs):
+        on_message({"type": "agent_message", "name": "Engineer", "content": "hello"})
+        report = os.path.join(work_dir, "report.md")
+        with open(report, "w") as f:
+            f.write("# Report")
+        artifacts = [{"path": report, "name": "report.md", "type": "markdown"}]
+        return {"result": None, "work_dir": work_dir, "artifacts": artifacts, "messages": []}
+
+    monkeypatch.setenv("COGNITIONFLOW_WORKSPACE", str(tmp_path))
+    monkeypatch.setattr(main, "run_workflow", fake_run_workflow)
+    monkeypatch.setattr(main, "save_run", lambda **kwargs: None)
+    for store, _ in main._rate_limit_shards:
+        store.clear()
+
+    with TestClient(main.app) as client:
+        response = client.post("/run", json={})
+        assert response.status_code == 200
+        run_id = response.json()["run_id"]
+
+        with client.stream("GET", f"/runs/{run_id}/stream") as stream:
+            body = "".join(stream.iter_text())
+
+        assert "event: agent_message" in body
+        assert "event: done" in body
+        first = client.get(f"/runs/{run_id}")
+        assert first.json()["status"] == "completed"
+        # Server-internal state (filename -> filesystem path index) is not exposed
+        assert not any(key.startswith("_") or key == "artifact_index" for key in first.json())
+        assert "_response" in main.RUNS[run_id]
+        assert client.get(f"/runs/{run_id}").content == first.content
+
+        artifact = client.get(f"/runs/{run_id}/artifacts/report.md")
+        assert artifact.status_code == 200
+        assert artifact.headers["content-type"].startswith("text/markdown")
+        assert "max-age" in artifact.headers["cache-control"]
+        assert client.get(f"/runs/{run_id}/artifacts/missing.md").status_code == 404
+
+
+def test_cleanup_expired_workspaces_pops_only_old_entries(tmp_path):
+    """Indexed workspaces past CLEANUP_AGE_HOURS are removed; fresh ones are kept."""
+    import time
+    from api import main
+
+    old_dir = tmp_path / "old-run"
+    new_dir = tmp_path / "new-run"
+    old_dir.mkdir()
+    new_dir.mkdir()
+    old_ts = time.time() - main.CLEANUP_AGE_HOURS * 3600 - 60
+    os.utime(old_dir, (old_ts, old_ts))
+
+    main._workspace_heap.clear()
+    main._workspace_heap.append((old_ts, str(old_dir)))
+    main.track_workspace(str(new_dir))
+
+    assert main.cleanup_expired_workspaces() == 1
+    assert not old_dir.exists()
+    assert new_dir.exists()
+    assert [path for _, path in main._workspace_heap] == [str(new_dir)]
@@ -37,6 +37,21 @@ def test_get_config_openai(monkeypatch):
     assert "base_url" not in cfg["config_list"][0] or cfg["config_list"][0].get("base_url")
 
 
+def test_get_config_prompt_cache(monkeypatch):
+    """LLM response cache uses AutoGen's default seed unless disabled."""
+    monkeypatch.setattr("cognitionflow.config.load_env", lambda: None)
+    monkeypatch.setenv("GROQ_API_KEY", "test_groq_key")
+    monkeypatch.delenv("COGNITIONFLOW_PROMPT_CACHE", raising=False)
+    assert get_config()["cache_seed"] == 41
+    monkeypatch.setenv("COGNITIONFLOW_PROMPT_CACHE", "off")
+    assert get_config()["cache_seed"] is None
+    monkeypatch.setenv("COGNITIONFLOW_PROMPT_CACHE", "0")
+    assert get_config()["cache_seed"] == 0
+    monkeypatch.setenv("COGNITIONFLOW_PROMPT_CACHE", "sometimes")
+    with pytest.raises(ValueError, match="COGNITIONFLOW_PROMPT_CACHE"):
+        get_config()
+
+
 def test_get_workspace_dir_default(monkeypatch):
     """Default workspace is /tmp/cognitionflow_workspace (avoids uvicorn reload loops)."""
     monkeypatch.delenv("COGNITIONFLOW_WORKSPACE", raising=False)
@@ -49,3 +64,19 @@ def test_get_workspace_dir_custom(monkeypatch):
     monkeypatch.setenv("COGNITIONFLOW_WORKSPACE", "/custom/workspace")
     from cognitionflow.config import get_workspace_dir
     assert get_workspace_dir() == "/custom/workspace"
+
+
+def test_load_env_parses_dotenv_once(monkeypatch):
+    """load_env is memoized: repeated calls don't re-read .env."""
+    import dotenv
+    from cognitionflow.config import load_env
+
+    calls = []
+    monkeypatch.setattr(dotenv, "load_dotenv", lambda *a, **k: calls.append(1))
+    load_env.cache_clear()
+    try:
+        load_env()
+        load_env()
+        assert len(calls) == 1
+    finally:
+        load_env.cache_clear()
@@ -62,3 +62,51 @@ def test_discover_artifacts_empty_dir():
     with tempfile.TemporaryDirectory() as tmpdir:
         artifacts = discover_artifacts(tmpdir)
         assert artifacts == []
+
+
+def test_extract_code_blocks():
+    """_extract_code_blocks returns fenced Python bodies and [] for prose."""
+    from cognitionflow.orchestration import _extract_code_blocks
+
+    content = "Plan:\n```python\nprint(1)\n```\nthen\n```python\nx = 2\n```"
+    assert _extract_code_blocks(content) == ["print(1)", "x = 2"]
+    assert _extract_code_blocks("No code here.") == []
+
+
+def test_iso_now_format():
+    """iso_now returns a UTC ISO-8601 timestamp with microseconds and 'Z'."""
+    from datetime import datetime
+    from cognitionflow.orchestration import iso_now
+
+    stamp = iso_now()
+    assert stamp.endswith("Z")
+    assert datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def test_make_message_dict_types():
+    """Message type precedence: execution output > approval > code > plain text."""
+    from cognitionflow.orchestration import _make_message_dict
+
+    def msg_type(content):
+        return _make_message_dict("Agent", "GroupChat", content)["type"]
+
+    assert msg_type("Looks fine.") == "agent_message"
+    assert msg_type("```python\nprint(1)\n```") == "code_generation"
+    assert msg_type("All good.\nPIPELINE_COMPLETE") == "review_approved"
+    assert msg_type("PIPELINE_COMPLETE\nExitCode: 0 (execution succeeded)") == "code_execution"
+
+
+def test_discover_artifacts_skips_symlinks_and_dotfiles(tmp_path):
+    """discover_artifacts ignores symlinks (which may point outside work_dir) and dotfiles."""
+    from cognitionflow.orchestration import discover_artifacts
+
+    outside = tmp_path / "secret.txt"
+    outside.write_text("secret")
+    work_dir = tmp_path / "run"
+    work_dir.mkdir()
+    (work_dir / "report.md").write_text("# Report")
+    (work_dir / ".hidden.md").write_text("hidden")
+    (work_dir / "leak.txt").symlink_to(outside)
+
+    names = [a["name"] for a in discover_artifacts(str(work_dir))]
+    assert names == ["report.md"]